@@ -53,19 +53,38 @@ def is_safe(levels: list[int]) -> bool:
     return True
 
 
-lines = open('./2024/day2/input2.txt').readlines()
-reports = [line.strip().split() for line in lines]
-reports = [list(map(int, report)) for report in reports]
-
-result = 0
-for report in reports:
-    if is_safe(report):
-        result += 1
-        continue
-    for i in range(len(report)):
-        if is_safe(get_without(report, i)):
-            result += 1
-            break
-
-
-print(result)  # 700
+def _dampened_in_order(levels: list[int], sign: int) -> bool:
+    # one left to right pass, `clean` means every level so far is kept,
+    # `skipped` that exactly one was dropped, both ending on level `i`
+    def good(a: int, b: int) -> bool:
+        return 1 <= (b - a) * sign <= 3
+
+    n = len(levels)
+    if n <= 2:
+        return True
+
+    # states for levels i - 2 and i - 1, dropping level 0 starts clean at 1
+    clean_prev2, clean_prev = True, good(levels[0], levels[1])
+    skipped_prev = True
+
+    for i in range(2, n):
+        clean = clean_prev and good(levels[i - 1], levels[i])
+        skipped = (skipped_prev and good(levels[i - 1], levels[i])) or (
+            clean_prev2 and good(levels[i - 2], levels[i])
+        )
+        clean_prev2, clean_prev, skipped_prev = clean_prev, clean, skipped
+
+    # dropping the last level only needs the rest to be clean
+    return clean_prev or skipped_prev or clean_prev2
+
+
+def is_safe_dampened(levels: list[int]) -> bool:
+    return _dampened_in_order(levels, 1) or _dampened_in_order(levels, -1)
+
+
+if __name__ == '__main__':
+    lines = open('./2024/day2/input2.txt').readlines()
+    reports = [line.strip().split() for line in lines]
+    reports = [list(map(int, report)) for report in reports]
+
+    print(sum(map(is_safe_dampened, reports)))  # 700
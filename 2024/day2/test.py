@@ -0,0 +1,53 @@
+import random
+
+from main2 import get_without, is_safe, is_safe_dampened
+from vectorized import classify, load_reports
+
+
+def is_safe_brute_force(levels: list[int]) -> bool:
+    return is_safe(levels) or any(
+        is_safe(get_without(levels, i)) for i in range(len(levels))
+    )
+
+
+def test_example():
+    reports = [
+        [7, 6, 4, 2, 1],
+        [1, 2, 7, 8, 9],
+        [9, 7, 6, 2, 1],
+        [1, 3, 2, 4, 5],
+        [8, 6, 4, 4, 1],
+        [1, 3, 6, 7, 9],
+    ]
+    assert [is_safe_dampened(report) for report in reports] == [
+        True,
+        False,
+        False,
+        True,
+        True,
+        True,
+    ]
+
+
+def test_matches_brute_force():
+    rng = random.Random(2)
+    for _ in range(20_000):
+        levels = [rng.randint(0, 2)]
+        for _ in range(rng.randint(0, 8)):
+            levels.append(levels[-1] + rng.randint(-4, 4))
+
+        assert is_safe_dampened(levels) == is_safe_brute_force(levels), levels
+
+
+def test_vectorized_matches_single_pass():
+    rng = random.Random(3)
+    reports = []
+    for _ in range(5_000):
+        levels = [rng.randint(0, 2)]
+        for _ in range(rng.randint(0, 8)):
+            levels.append(levels[-1] + rng.randint(-4, 4))
+        reports.append(levels)
+
+    safe, dampened = classify(*load_reports([' '.join(map(str, r)) for r in reports]))
+    assert safe.tolist() == [is_safe(report) for report in reports]
+    assert dampened.tolist() == [is_safe_dampened(report) for report in reports]
@@ -0,0 +1,85 @@
+"""
+NumPy version of both parts: all reports are padded into one 2D array, the
+level differences are taken at once and every report is classified with
+boolean masks instead of a Python loop per report.
+"""
+
+import time
+
+import numpy as np
+
+
+def load_reports(lines: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    rows = [np.array(line.split(), dtype=np.int64) for line in lines if line.strip()]
+    lengths = np.array([len(row) for row in rows], dtype=np.int64)
+
+    width = int(lengths.max(initial=0))
+    levels = np.zeros((len(rows), width), dtype=np.int64)
+    levels[np.arange(width) < lengths[:, None]] = np.concatenate(
+        rows or [np.empty(0, dtype=np.int64)]
+    )
+
+    return levels, lengths
+
+
+def _good_steps(diffs: np.ndarray, valid: np.ndarray, sign: int) -> np.ndarray:
+    # steps past the end of a report never make it unsafe
+    steps = diffs * sign
+    return ((steps >= 1) & (steps <= 3)) | ~valid
+
+
+def _safe_in_order(
+    levels: np.ndarray, lengths: np.ndarray, sign: int
+) -> tuple[np.ndarray, np.ndarray]:
+    count, width = levels.shape
+    if width < 2:
+        ones = np.ones(count, dtype=bool)
+        return ones, ones
+
+    columns = np.arange(width - 1)
+    good = _good_steps(
+        np.diff(levels, axis=1), columns < (lengths - 1)[:, None], sign
+    )
+    # steps over a removed level, level k - 1 straight to level k + 1
+    skip = _good_steps(
+        levels[:, 2:] - levels[:, :-2], columns[:-1] < (lengths - 2)[:, None], sign
+    )
+
+    # prefix[:, j] - the first j steps are fine, suffix[:, j] - steps from j on
+    true = np.ones((count, 1), dtype=bool)
+    prefix = np.hstack([true, np.logical_and.accumulate(good, axis=1)])
+    suffix = np.hstack(
+        [np.logical_and.accumulate(good[:, ::-1], axis=1)[:, ::-1], true]
+    )
+
+    safe = suffix[:, 0]
+
+    rows = np.arange(count)
+    # drop the first or the last level
+    dampened = safe | suffix[:, 1] | prefix[rows, np.maximum(lengths - 2, 0)]
+    # drop level k for 0 < k < n - 1
+    middle = prefix[:, :-2] & skip & suffix[:, 2:]
+    dampened |= middle.any(axis=1) | (lengths <= 2)
+
+    return safe, dampened
+
+
+def classify(levels: np.ndarray, lengths: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    up_safe, up_dampened = _safe_in_order(levels, lengths, 1)
+    down_safe, down_dampened = _safe_in_order(levels, lengths, -1)
+    return up_safe | down_safe, up_dampened | down_dampened
+
+
+def main():
+    start = time.perf_counter_ns()
+
+    levels, lengths = load_reports(open('./2024/day2/input.txt').readlines())
+    safe, dampened = classify(levels, lengths)
+
+    print(safe.sum())  # 670
+    print(dampened.sum())  # 700
+    print(f'Found in {(time.perf_counter_ns() - start) / 1_000_000_000:0.6f} s')
+
+
+if __name__ == '__main__':
+    main()
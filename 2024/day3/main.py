@@ -18,108 +18,29 @@ Only the four highlighted sections are real mul instructions. Adding up the resu
 Scan the corrupted memory for uncorrupted mul instructions. What do you get if you add up all of the results of the multiplications?
 """
 
-
-class Helper:
-    def __init__(self) -> None:
-        self.current_text = []
-        self.funcs = self._get_next_func()
-        self.expect_func = next(self.funcs)
-
-    @property
-    def x(self) -> int:
-        start_idx = len('mul(')
-        end_idx = self.current_text.index(',')
-        result = self.current_text[start_idx:end_idx]
-        result = ''.join(result)
-        return int(result)
-
-    @property
-    def y(self) -> int:
-        start_idx = self.current_text.index(',') + 1
-        end_idx = self.current_text.index(')')
-        result = self.current_text[start_idx:end_idx]
-        result = ''.join(result)
-        return int(result)
-
-    def _get_next_func(self):
-        yield self._expect_mul
-        yield self._expect_open_brace
-        yield self._expect_digit
-        yield self._expect_digit_or_comma
-        yield self._expect_digit
-        yield self._expect_digit_or_close_brace
-
-    def _expect_mul(self, char: str) -> bool:
-        match len(self.current_text):
-            case 0:
-                return char == 'm'
-            case 1:
-                return char == 'u'
-            case 2:
-                if char == 'l':
-                    self.expect_func = next(self.funcs)
-                    return True
-            case _:
-                raise Exception('This method should not be called.')
-        return False
-
-    def _expect_open_brace(self, char: str) -> bool:
-        if char == '(':
-            self.expect_func = next(self.funcs)
-            return True
-        return False
-
-    def _expect_digit(self, char: str) -> bool:
-        if char.isdigit():
-            self.expect_func = next(self.funcs)
-            return True
-        return False
-
-    def _expect_digit_or_comma(self, char: str) -> bool:
-        if char == ',':
-            self.expect_func = next(self.funcs)
-            return True
-        return char.isdigit()
-
-    def _expect_digit_or_close_brace(self, char: str) -> bool:
-        if char == ')':
-            return True
-        return char.isdigit()
-
-    def __eval(self) -> int:
-        text = ''.join(self.current_text)
-        if not (text.startswith('mul(') and text.endswith(')') and ',' in text):
-            raise Exception('Should not call this method yet.')
-
-        return self.x * self.y
-
-    def __repr__(self) -> str:
-        return ''.join(self.current_text)
-
-    def add_next(self, char: str) -> int | None:
-        if not self.is_valid(char):
-            if len(self.current_text) > 0:
-                self.__init__()
-                return self.add_next(char)
-            return None
-        self.current_text.append(char)
-        if char == ')':
-            result = self.__eval()
-            self.__init__()
-            return result
-        return None
-
-    def is_valid(self, char: str) -> bool:
-        return self.expect_func(char)
-
-
-with open('./2024/day3/input.txt') as file:
-    sums = []
-    helper = Helper()
-
-    while char := file.read(1):
-        if isinstance(res := helper.add_next(char), int):
-            sums.append(res)
-
-    print(len(sums))
-    print(sum(sums))
+import argparse
+
+from scanner import (
+    iter_mapped_tokens,
+    iter_tokens,
+    map_file,
+    read_chunks,
+    sum_muls,
+)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('path', nargs='?', default='./2024/day3/input.txt')
+    parser.add_argument('--mmap', action='store_true', help='map the file')
+    args = parser.parse_args()
+
+    if args.mmap:
+        with map_file(args.path) as mapped:
+            count, total = sum_muls(iter_mapped_tokens(mapped))
+    else:
+        with open(args.path, 'rb') as file:
+            count, total = sum_muls(iter_tokens(read_chunks(file)))
+
+    print(count)
+    print(total)
@@ -0,0 +1,239 @@
+import mmap
+import os
+import re
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import BinaryIO, NamedTuple
+
+
+TOKEN = re.compile(rb"mul\((\d{1,3}),(\d{1,3})\)|do\(\)|don't\(\)")
+DO = b'do()'
+DONT = b"don't()"
+
+# longest possible token is `mul(123,123)`
+MAX_TOKEN_LEN = len('mul(123,123)')
+CHUNK_SIZE = 1 << 20
+
+
+def read_chunks(file: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    while chunk := file.read(chunk_size):
+        yield chunk
+
+
+def read_range(
+    file: BinaryIO, start: int, end: int, chunk_size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    file.seek(start)
+    while start < end and (chunk := file.read(min(chunk_size, end - start))):
+        start += len(chunk)
+        yield chunk
+
+
+@contextmanager
+def map_file(path: str) -> Iterator[bytes | mmap.mmap]:
+    # read-only view of the file, pages come straight from the page cache
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            # empty files can't be mapped
+            yield b''
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            yield mapped
+
+
+def iter_tokens(chunks: Iterable[bytes]) -> Iterator[re.Match]:
+    tail = b''
+
+    for chunk in chunks:
+        data = tail + chunk
+        # tokens starting before `safe` are complete if they are there at all,
+        # anything after it can still be cut off by the chunk boundary
+        safe = len(data) - MAX_TOKEN_LEN + 1
+        keep_from = max(safe, 0)
+
+        for match in TOKEN.finditer(data):
+            if match.start() >= safe:
+                break
+            keep_from = max(keep_from, match.end())
+            yield match
+
+        tail = data[keep_from:]
+
+    yield from TOKEN.finditer(tail)
+
+
+def iter_mapped_tokens(
+    mapped: bytes | mmap.mmap,
+    start: int = 0,
+    end: int | None = None,
+    window: int = 16 * CHUNK_SIZE,
+) -> Iterator[re.Match]:
+    # same block logic as `iter_tokens` but with pos/endpos on the mapping
+    # itself, pages behind the current window are dropped so the resident
+    # size stays flat
+    end = len(mapped) if end is None else end
+    pos = start
+
+    while pos < end:
+        safe = pos + window
+        next_pos = safe
+        scan_end = min(safe + MAX_TOKEN_LEN - 1, end)
+
+        for match in TOKEN.finditer(mapped, pos, scan_end):
+            if match.start() >= safe:
+                break
+            next_pos = max(next_pos, match.end())
+            yield match
+
+        pos = next_pos
+
+        if isinstance(mapped, mmap.mmap) and hasattr(mmap, 'MADV_DONTNEED'):
+            done = min(pos, end) // mmap.PAGESIZE * mmap.PAGESIZE
+            if done:
+                mapped.madvise(mmap.MADV_DONTNEED, 0, done)
+
+
+def sum_muls(tokens: Iterable[re.Match]) -> tuple[int, int]:
+    count = total = 0
+    for match in tokens:
+        if match[1] is not None:
+            count += 1
+            total += int(match[1]) * int(match[2])
+    return count, total
+
+
+def sum_enabled_muls(tokens: Iterable[re.Match]) -> tuple[int, int]:
+    count = total = 0
+    mul_enabled = True
+
+    for match in tokens:
+        if match[1] is not None:
+            if mul_enabled:
+                count += 1
+                total += int(match[1]) * int(match[2])
+        else:
+            mul_enabled = match[0] == DO
+
+    return count, total
+
+
+class RangeResult(NamedTuple):
+    # muls before the first do()/don't() of the range depend on the state the
+    # previous ranges leave behind, everything after it is already settled
+    head: bytes
+    tail: bytes
+    before_count: int
+    before_total: int
+    after_count: int
+    after_total: int
+    last_state: bool | None
+
+
+def _fold_range(
+    tokens: Iterable[re.Match],
+) -> tuple[int, int, int, int, bool | None]:
+    count = total = before_count = before_total = 0
+    mul_enabled: bool | None = None
+
+    for match in tokens:
+        if match[1] is None:
+            if mul_enabled is None:
+                before_count, before_total = count, total
+                count = total = 0
+            mul_enabled = match[0] == DO
+        elif mul_enabled is not False:
+            count += 1
+            total += int(match[1]) * int(match[2])
+
+    if mul_enabled is None:
+        return count, total, 0, 0, None
+    return before_count, before_total, count, total, mul_enabled
+
+
+def scan_range(
+    path: str, start: int, end: int, use_mmap: bool = False
+) -> RangeResult:
+    head_end = min(start + MAX_TOKEN_LEN - 1, end)
+    tail_start = max(start, end - MAX_TOKEN_LEN + 1)
+
+    if use_mmap:
+        with map_file(path) as mapped:
+            # endpos hides the rest of the file, tokens cut by it are
+            # stitched together by the caller
+            folded = _fold_range(iter_mapped_tokens(mapped, start, end))
+            head, tail = mapped[start:head_end], mapped[tail_start:end]
+    else:
+        with open(path, 'rb') as file:
+            folded = _fold_range(iter_tokens(read_range(file, start, end)))
+
+            # bytes that may hold a token cut by the range edges
+            file.seek(start)
+            head = file.read(head_end - start)
+            file.seek(tail_start)
+            tail = file.read(end - tail_start)
+
+    return RangeResult(head, tail, *folded)
+
+
+def sum_enabled_muls_parallel(
+    path: str,
+    workers: int | None = None,
+    chunk_size: int = 64 * CHUNK_SIZE,
+    use_mmap: bool = False,
+) -> tuple[int, int]:
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(path)
+
+    if workers <= 1 or size <= chunk_size:
+        if use_mmap:
+            with map_file(path) as mapped:
+                return sum_enabled_muls(iter_mapped_tokens(mapped))
+        with open(path, 'rb') as file:
+            return sum_enabled_muls(iter_tokens(read_chunks(file)))
+
+    # a token must not be able to span more than two ranges
+    chunk_size = max(chunk_size, MAX_TOKEN_LEN)
+    bounds = [
+        (start, min(start + chunk_size, size))
+        for start in range(0, size, chunk_size)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(
+            scan_range,
+            [path] * len(bounds),
+            [start for start, _ in bounds],
+            [end for _, end in bounds],
+            [use_mmap] * len(bounds),
+        )
+
+        count = total = 0
+        mul_enabled = True
+        tail = b''
+
+        for result in results:
+            # tokens split between the previous range and this one
+            window = tail + result.head
+            for match in TOKEN.finditer(window):
+                if match.start() >= len(tail) or match.end() <= len(tail):
+                    continue
+                if match[1] is None:
+                    mul_enabled = match[0] == DO
+                elif mul_enabled:
+                    count += 1
+                    total += int(match[1]) * int(match[2])
+
+            if mul_enabled:
+                count += result.before_count
+                total += result.before_total
+            count += result.after_count
+            total += result.after_total
+
+            if result.last_state is not None:
+                mul_enabled = result.last_state
+            tail = result.tail
+
+    return count, total
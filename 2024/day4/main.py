@@ -40,6 +40,57 @@ Take a look at the little Elf's word search. How many times does XMAS appear?
 """
 
 import operator
+from collections import deque
+from collections.abc import Iterator
+
+import numpy as np
+
+
+DIRECTIONS = [(di, dj) for di in (-1, 0, 1) for dj in (-1, 0, 1) if di or dj]
+
+Line = tuple[int, int, int, int]
+
+
+class AhoCorasick:
+    def __init__(self, words: list[str]) -> None:
+        self.words = words
+        self.goto: list[dict[int, int]] = [{}]
+        self.fail = [0]
+        # indexes of the words ending in each state, including suffixes
+        self.output: list[list[int]] = [[]]
+
+        for word_idx, word in enumerate(words):
+            state = 0
+            for char in word.encode():
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state].append(word_idx)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fail = self.fail[state]
+                while fail and char not in self.goto[fail]:
+                    fail = self.fail[fail]
+                self.fail[child] = self.goto[fail].get(char, 0)
+                self.output[child] += self.output[self.fail[child]]
+
+    def search(self, text: bytes) -> Iterator[tuple[int, int]]:
+        # (index of the first letter, word index) for every match
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for idx, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for word_idx in output[state]:
+                yield idx - len(self.words[word_idx]) + 1, word_idx
 
 
 class Solver:
@@ -77,9 +128,87 @@ class Solver:
                 occurrances += self._check_all_dirs(i, j)
         return occurrances
 
+    def get_lines(self) -> Iterator[tuple[bytes, Line]]:
+        # every row, column, diagonal and anti-diagonal, each also reversed,
+        # with (start row, start column, row step, column step)
+        rows = [row for row in self.array if row]
+        height, width = len(rows), len(rows[0]) if rows else 0
+
+        starts = {
+            (0, 1): [(i, 0) for i in range(height)],
+            (1, 0): [(0, j) for j in range(width)],
+            (1, 1): [(i, 0) for i in range(height)] + [(0, j) for j in range(1, width)],
+            (1, -1): [(0, j) for j in range(width)]
+            + [(i, width - 1) for i in range(1, height)],
+        }
+
+        for (di, dj), cells in starts.items():
+            for i, j in cells:
+                length = 0
+                chars = []
+                while 0 <= i + di * length < height and 0 <= j + dj * length < width:
+                    chars.append(rows[i + di * length][j + dj * length])
+                    length += 1
+
+                line = ''.join(chars).encode()
+                yield line, (i, j, di, dj)
+                end_i, end_j = i + di * (length - 1), j + dj * (length - 1)
+                yield line[::-1], (end_i, end_j, -di, -dj)
+
+    def _iter_matches(self, words: list[str]) -> Iterator[tuple[int, Line]]:
+        automaton = AhoCorasick(words)
+        for line, (i, j, di, dj) in self.get_lines():
+            for idx, word_idx in automaton.search(line):
+                yield word_idx, (i + di * idx, j + dj * idx, di, dj)
+
+    def count_words(self, words: list[str]) -> dict[str, int]:
+        counts = dict.fromkeys(words, 0)
+        for word_idx, _ in self._iter_matches(words):
+            counts[words[word_idx]] += 1
+        return counts
+
+    def find_words(self, words: list[str]) -> dict[str, list[Line]]:
+        # (row, column, row step, column step) of the first letter
+        positions: dict[str, list[Line]] = {word: [] for word in words}
+        for word_idx, position in self._iter_matches(words):
+            positions[words[word_idx]].append(position)
+        return positions
+
+    def to_grid(self) -> np.ndarray:
+        rows = [row for row in self.array if row]
+        data = ''.join(rows).encode()
+        return np.frombuffer(data, dtype=np.uint8).reshape(len(rows), -1)
+
+    def find_all_vectorized(self) -> int:
+        # for every direction, one boolean mask over all starting cells that
+        # stay on the grid, ANDed with the shifted grid for each key letter
+        grid = self.to_grid()
+        height, width = grid.shape
+        last = len(self.key) - 1
+        occurrances = 0
+
+        for di, dj in DIRECTIONS:
+            top, bottom = max(0, -di * last), height - max(0, di * last)
+            left, right = max(0, -dj * last), width - max(0, dj * last)
+            if top >= bottom or left >= right:
+                continue
+
+            mask = np.ones((bottom - top, right - left), dtype=bool)
+            for idx, char in enumerate(self.key.encode()):
+                shifted = grid[
+                    top + di * idx : bottom + di * idx,
+                    left + dj * idx : right + dj * idx,
+                ]
+                mask &= shifted == char
+            occurrances += int(mask.sum())
+
+        return occurrances
+
 
 if __name__ == '__main__':
     lines = open('./2024/day4/input.txt').readlines()
     solver = Solver(lines, 'XMAS')
 
     print(solver.find_all())  # 2571
+    print(solver.find_all_vectorized())  # 2571
+    print(solver.count_words(['XMAS', 'SAMX', 'MAS']))
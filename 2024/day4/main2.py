@@ -26,6 +26,53 @@ In this example, an X-MAS appears 9 times.
 Flip the word search from the instructions back over to the word search side and try again. How many times does an X-MAS appear?
 """
 
+import numpy as np
+
+
+Stencil = dict[tuple[int, int], str]
+
+
+def x_stencils(key: str) -> list[Stencil]:
+    # key read either way on both diagonals, centred on the middle letter
+    if len(key) % 2 == 0:
+        raise ValueError(f'Key {key!r} has no middle letter to cross on.')
+
+    half = len(key) // 2
+    stencils = []
+    for first in (key, key[::-1]):
+        for second in (key, key[::-1]):
+            stencil: Stencil = {}
+            for idx in range(len(key)):
+                stencil[(idx - half, idx - half)] = first[idx]
+                stencil[(idx - half, half - idx)] = second[idx]
+            stencils.append(stencil)
+    return stencils
+
+
+def count_template(grid: np.ndarray, stencils: list[Stencil]) -> int:
+    # cells where any of the stencils matches, every (offset, letters)
+    # constraint is one shifted view of the grid compared at once
+    height, width = grid.shape
+    offsets = [offset for stencil in stencils for offset in stencil]
+    top = max(0, -min(di for di, _ in offsets))
+    bottom = max(0, max(di for di, _ in offsets))
+    left = max(0, -min(dj for _, dj in offsets))
+    right = max(0, max(dj for _, dj in offsets))
+    if top + bottom >= height or left + right >= width:
+        return 0
+
+    found = np.zeros((height - top - bottom, width - left - right), dtype=bool)
+    for stencil in stencils:
+        mask = np.ones_like(found)
+        for (di, dj), letters in stencil.items():
+            view = grid[
+                top + di : height - bottom + di, left + dj : width - right + dj
+            ]
+            mask &= np.isin(view, np.frombuffer(letters.encode(), dtype=np.uint8))
+        found |= mask
+
+    return int(found.sum())
+
 
 class Solver:
     def __init__(self, array: list[str], key: str) -> None:
@@ -113,9 +160,18 @@ class Solver:
                 occurrances += self._is_x(i, j)
         return occurrances
 
+    def to_grid(self) -> np.ndarray:
+        rows = [row for row in self.array if row]
+        data = ''.join(rows).encode()
+        return np.frombuffer(data, dtype=np.uint8).reshape(len(rows), -1)
+
+    def find_all_vectorized(self) -> int:
+        return count_template(self.to_grid(), x_stencils(self.key))
+
 
 if __name__ == '__main__':
     lines = open('./2024/day4/input2.txt').readlines()
     solver = Solver(lines, 'MAS')
 
-    print(solver.find_all())  # 2571
+    print(solver.find_all())  # 1992
+    print(solver.find_all_vectorized())  # 1992
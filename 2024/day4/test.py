@@ -1,3 +1,5 @@
+import pytest
+
 from main import Solver
 
 KEY = 'XMAS'
@@ -58,3 +60,79 @@ S.S.S.S.SS
 """.strip().splitlines()
     solver = Solver(lines, KEY)
     assert solver.find_all() == 18
+
+
+def test_vectorized():
+    lines = """
+MMMSXXMASM
+MSAMXMSMSA
+AMXSXMAAMM
+MSAMASMSMX
+XMASAMXAMM
+XXAMMXXAMA
+SMSMSASXSS
+SAXAMASAAA
+MAMMMXMMMM
+MXMXAXMASX
+""".strip().splitlines()
+    solver = Solver(lines, KEY)
+    assert solver.find_all_vectorized() == 18
+
+
+def test_vectorized_small_grid():
+    lines = """
+XMA
+MAS
+""".strip().splitlines()
+    solver = Solver(lines, KEY)
+    assert solver.find_all_vectorized() == solver.find_all() == 0
+
+
+def test_count_words():
+    lines = """
+MMMSXXMASM
+MSAMXMSMSA
+AMXSXMAAMM
+MSAMASMSMX
+XMASAMXAMM
+XXAMMXXAMA
+SMSMSASXSS
+SAXAMASAAA
+MAMMMXMMMM
+MXMXAXMASX
+""".strip().splitlines()
+    solver = Solver(lines, KEY)
+    counts = solver.count_words(['XMAS', 'SAMX', 'MAS'])
+    assert counts == {
+        'XMAS': 18,
+        'SAMX': 18,
+        'MAS': Solver(lines, 'MAS').find_all(),
+    }
+    assert (4, 0, 0, 1) in solver.find_words(['XMAS'])['XMAS']
+
+
+def test_x_template():
+    from main2 import Solver as XSolver, count_template, x_stencils
+
+    lines = """
+.M.S......
+..A..MSMS.
+.M.S.MAA..
+..A.ASMSM.
+.M.S.M....
+..........
+S.S.S.S.S.
+.A.A.A.A..
+M.M.M.M.M.
+..........
+""".strip().splitlines()
+    solver = XSolver(lines, 'MAS')
+    assert solver.find_all_vectorized() == solver.find_all() == 9
+
+    # plus shaped template
+    plus = [{(0, 0): 'A', (-1, 0): 'M', (1, 0): 'S', (0, -1): 'M', (0, 1): 'SX'}]
+    lines = ['.M..', 'MAX.', '.SMA', '..S.']
+    assert count_template(XSolver(lines, 'MAS').to_grid(), plus) == 1
+
+    with pytest.raises(ValueError):
+        x_stencils('XMAS')
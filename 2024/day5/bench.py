@@ -0,0 +1,74 @@
+"""
+Benchmark of the rulebook backends: `is_valid_update` of the dict and bitset
+solvers over a synthetic file of shuffled copies of the real updates.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from main2 import SOLVERS, Solver
+
+
+def read_input(path: str) -> tuple[list[str], list[list[int]]]:
+    rules, updates = [], []
+    with open(path) as file:
+        while line := file.readline():
+            if not (line := line.strip()):
+                break
+            rules.append(line)
+        while line := file.readline():
+            if line := line.strip():
+                updates.append(list(map(int, line.split(','))))
+    return rules, updates
+
+
+def write_updates(
+    path: str, rules: list[str], samples: list[list[int]], count: int
+) -> None:
+    # the whole rule set has cycles, only pages of one real update are known
+    # to be orderable together
+    solver = Solver(rules)
+
+    random.seed(5)
+    with open(path, 'w') as file:
+        for _ in range(count):
+            sample = random.choice(samples)
+            update = random.sample(sample, k=len(sample))
+            # about half of them valid
+            if random.random() < 0.5:
+                update = solver.fix_update(update)
+            file.write(','.join(map(str, update)) + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', '--count', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rules, samples = read_input('./2024/day5/input.txt')
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'updates.txt')
+        write_updates(path, rules, samples, args.count)
+
+        with open(path) as file:
+            updates = [list(map(int, line.split(','))) for line in file]
+
+    for name, solver_type in SOLVERS.items():
+        solver = solver_type(rules)
+
+        start = time.perf_counter()
+        valid = sum(solver.is_valid_update(update) for update in updates)
+        elapsed = time.perf_counter() - start
+
+        print(
+            f'{name:<7} {elapsed:.3f} s  {len(updates) / elapsed:,.0f} updates/s  '
+            f'({valid} valid)'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -75,6 +75,11 @@ Of course, you'll need to be careful: the actual list of page ordering rules is
 Determine which updates are already in the correct order. What do you get if you add up the middle page number from those correctly-ordered updates?
 """
 
+import argparse
+import sys
+from collections.abc import Iterable, Iterator
+from typing import TextIO
+
 
 class Solver:
     def __init__(self, rules: list[str]) -> None:
@@ -100,32 +105,80 @@ class Solver:
         return True
 
 
-if __name__ == '__main__':
+class BitsetSolver(Solver):
+    # same rules with one int per page, bit `p` is set when page `p` has to
+    # come before it, so a whole update is checked with a running OR-mask
+    def __init__(self, rules: list[str]) -> None:
+        super().__init__(rules)
+        self.masks = self._create_masks()
+
+    def _create_masks(self) -> list[int]:
+        pages = [page for rule in self.rules for page in map(int, rule)]
+        masks = [0] * (max(pages, default=0) + 1)
+        for page, lefts in self.rulebook.items():
+            for left in lefts:
+                masks[page] |= 1 << left
+        return masks
+
+    def _mask(self, page: int) -> int:
+        return self.masks[page] if page < len(self.masks) else 0
+
+    def is_valid_update(self, update: list[int]) -> bool:
+        seen = 0
+
+        for num in reversed(update):
+            if self._mask(num) & seen:
+                return False
+            seen |= 1 << num
+
+        return True
+
+
+def read_rules(file: TextIO) -> list[str]:
     rules: list[str] = []
-    updates: list[str] = []
+    while line := file.readline():
+        if not (line := line.strip()):
+            break
+        rules.append(line)
+    return rules
+
+
+def read_updates(file: TextIO) -> Iterator[list[int]]:
+    # one update at a time, the rest of the file is never held in memory
+    while line := file.readline():
+        if not (line := line.strip()):
+            break
+        yield list(map(int, line.split(',')))
 
-    with open('./2024/day5/input.txt') as file:
-        # gather rules
-        while line := file.readline():
-            if not (line := line.strip()):
-                break
-            rules.append(line)
 
-        # gather updates
-        while line := file.readline():
-            if not (line := line.strip()):
-                break
-            updates.append(line)
+def valid_updates(solver: Solver, updates: Iterable[list[int]]) -> Iterator[list[int]]:
+    return (update for update in updates if solver.is_valid_update(update))
 
-    solver = Solver(rules)
 
-    middle_sum = 0
+def middle_pages(updates: Iterable[list[int]]) -> Iterator[int]:
     for update in updates:
-        splited = list(map(int, update.split(',')))
-        if not solver.is_valid_update(splited):
-            continue
         # get middle element
-        assert len(splited) % 2 == 1
-        middle_sum += splited[len(splited) // 2]
+        assert len(update) % 2 == 1
+        yield update[len(update) // 2]
+
+
+SOLVERS = {
+    'dict': Solver,
+    'bitset': BitsetSolver,
+}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        'path', nargs='?', default='./2024/day5/input.txt', help='- reads stdin'
+    )
+    parser.add_argument('--backend', choices=SOLVERS, default='dict')
+    args = parser.parse_args()
+
+    with sys.stdin if args.path == '-' else open(args.path) as file:
+        solver = SOLVERS[args.backend](read_rules(file))
+        updates = read_updates(file)
+        middle_sum = sum(middle_pages(valid_updates(solver, updates)))
 
     print(middle_sum)  # 6267
@@ -12,14 +12,19 @@ After taking only the incorrectly-ordered updates and ordering them correctly, t
 Find the updates which are not in the correct order. What do you get if you add up the middle page numbers after correctly ordering just those updates?
 """
 
+import argparse
+import heapq
+import sys
+from collections.abc import Iterable, Iterator
 from pprint import pprint
-from functools import cmp_to_key
+from typing import TextIO
 
 
 class Solver:
     def __init__(self, rules: list[str]) -> None:
         self.rules = [rule.split('|') for rule in rules]
         self.rulebook = self._create_rulebook()
+        self.successors = self._create_successors()
 
     def _create_rulebook(self) -> dict[int, set[int]]:
         rulebook = {}
@@ -28,6 +33,13 @@ class Solver:
             rulebook.setdefault(right, set()).add(left)
         return rulebook
 
+    def _create_successors(self) -> dict[int, set[int]]:
+        successors = {}
+        for right, lefts in self.rulebook.items():
+            for left in lefts:
+                successors.setdefault(left, set()).add(right)
+        return successors
+
     def is_valid_update(self, update: list[int]) -> bool:
         seen = set()
 
@@ -39,45 +51,152 @@ class Solver:
 
         return True
 
+    def rank(self, update: list[int]) -> dict[int, int]:
+        # topological order of the rules restricted to the update's pages,
+        # ties go to the page that comes first in the update, so a valid
+        # update keeps its own order
+        pages = set(update)
+        position = {page: idx for idx, page in enumerate(update)}
+        in_degree = {
+            page: len(self.rulebook.get(page, set()) & pages) for page in update
+        }
+
+        ready = [position[page] for page in update if in_degree[page] == 0]
+        heapq.heapify(ready)
+        ranks: dict[int, int] = {}
+
+        while ready:
+            page = update[heapq.heappop(ready)]
+            ranks[page] = len(ranks)
+            for successor in self.successors.get(page, set()) & pages:
+                in_degree[successor] -= 1
+                if in_degree[successor] == 0:
+                    heapq.heappush(ready, position[successor])
+
+        if len(ranks) != len(pages):
+            raise Exception(f'Rules form a cycle in update `{update}`.')
+
+        return ranks
+
     def fix_update(self, update: list[int]) -> list[int]:
-        def cmp(a: int, b: int) -> int:
-            if a in self.rulebook.get(b, ()):
-                return -1
-            if b in self.rulebook.get(a, ()):
-                return 1
-            return 0
+        return sorted(update, key=self.rank(update).__getitem__)
+
+    def middle_page(self, update: list[int]) -> int:
+        # when the rules order every pair of pages in the update, the middle
+        # of the fixed update is the page with exactly half of the others
+        # before it, so no ordering has to be built
+        pages = set(update)
+        half = (len(update) - 1) // 2
+        for page in update:
+            before = len(self.rulebook.get(page, set()) & pages)
+            if before != half:
+                continue
+            # unrelated pages could end up on either side of it
+            after = len(self.successors.get(page, set()) & pages)
+            if before + after == len(pages) - 1:
+                return page
+
+        # rules leave the order open, fall back to the full ordering
+        fixed = self.fix_update(update)
+        return fixed[len(fixed) // 2]
+
+
+class BitsetSolver(Solver):
+    # same rules with one int per page, bit `p` is set when page `p` has to
+    # come before it (or after it for the successor masks), so a whole update
+    # is checked with a running OR-mask
+    def __init__(self, rules: list[str]) -> None:
+        super().__init__(rules)
+        self.masks = self._create_masks(self.rulebook)
+        self.successor_masks = self._create_masks(self.successors)
+
+    def _create_masks(self, book: dict[int, set[int]]) -> list[int]:
+        pages = [page for rule in self.rules for page in map(int, rule)]
+        masks = [0] * (max(pages, default=0) + 1)
+        for page, others in book.items():
+            for other in others:
+                masks[page] |= 1 << other
+        return masks
+
+    def _mask(self, page: int, masks: list[int] | None = None) -> int:
+        masks = self.masks if masks is None else masks
+        return masks[page] if page < len(masks) else 0
+
+    def is_valid_update(self, update: list[int]) -> bool:
+        seen = 0
 
-        return list(sorted(update, key=cmp_to_key(cmp)))
+        for num in reversed(update):
+            if self._mask(num) & seen:
+                return False
+            seen |= 1 << num
 
+        return True
 
-if __name__ == '__main__':
+    def middle_page(self, update: list[int]) -> int:
+        pages = 0
+        for page in update:
+            pages |= 1 << page
+
+        half = (len(update) - 1) // 2
+        for page in update:
+            before = (self._mask(page) & pages).bit_count()
+            if before != half:
+                continue
+            after = (self._mask(page, self.successor_masks) & pages).bit_count()
+            if before + after == len(update) - 1:
+                return page
+
+        fixed = self.fix_update(update)
+        return fixed[len(fixed) // 2]
+
+
+def read_rules(file: TextIO) -> list[str]:
     rules: list[str] = []
-    updates: list[str] = []
+    while line := file.readline():
+        if not (line := line.strip()):
+            break
+        rules.append(line)
+    return rules
 
-    with open('./2024/day5/input.txt') as file:
-        # gather rules
-        while line := file.readline():
-            if not (line := line.strip()):
-                break
-            rules.append(line)
 
-        # gather updates
-        while line := file.readline():
-            if not (line := line.strip()):
-                break
-            updates.append(line)
+def read_updates(file: TextIO) -> Iterator[list[int]]:
+    # one update at a time, the rest of the file is never held in memory
+    while line := file.readline():
+        if not (line := line.strip()):
+            break
+        yield list(map(int, line.split(',')))
 
-    solver = Solver(rules)
 
-    middle_sum = 0
-    for update in updates:
-        splited = list(map(int, update.split(',')))
-        if solver.is_valid_update(splited):
-            continue
+def invalid_updates(
+    solver: Solver, updates: Iterable[list[int]]
+) -> Iterator[list[int]]:
+    return (update for update in updates if not solver.is_valid_update(update))
 
-        splited = solver.fix_update(splited)
+
+def fixed_middle_pages(solver: Solver, updates: Iterable[list[int]]) -> Iterator[int]:
+    for update in updates:
         # get middle element
-        assert len(splited) % 2 == 1
-        middle_sum += splited[len(splited) // 2]
+        assert len(update) % 2 == 1
+        yield solver.middle_page(update)
+
+
+SOLVERS = {
+    'dict': Solver,
+    'bitset': BitsetSolver,
+}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        'path', nargs='?', default='./2024/day5/input.txt', help='- reads stdin'
+    )
+    parser.add_argument('--backend', choices=SOLVERS, default='dict')
+    args = parser.parse_args()
+
+    with sys.stdin if args.path == '-' else open(args.path) as file:
+        solver = SOLVERS[args.backend](read_rules(file))
+        updates = read_updates(file)
+        middle_sum = sum(fixed_middle_pages(solver, invalid_updates(solver, updates)))
 
     print(middle_sum)  # 5184
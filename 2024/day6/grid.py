@@ -0,0 +1,58 @@
+DIRECTIONS = '^>v<'
+UP, RIGHT, DOWN, LEFT = range(len(DIRECTIONS))
+STEPS = ((-1, 0), (0, 1), (1, 0), (0, -1))
+
+OBSTACLE = ord('#')
+
+
+class Grid:
+    # whole map lives in one flat bytearray, visited cells keep a bitmask of
+    # the directions the guard faced there (1 << direction)
+    def __init__(self, cells: bytes, width: int) -> None:
+        self.width = width
+        self.height = len(cells) // width if width else 0
+        self.size = self.height * self.width
+
+        self.cells = bytearray(cells[: self.size])
+        self.visited = bytearray(self.size)
+        self._blank = bytes(self.size)
+
+    @classmethod
+    def from_lines(cls, lines: list[str]) -> 'Grid':
+        width = len(lines[0]) if lines else 0
+        return cls(''.join(lines).encode(), width)
+
+    def reset(self) -> None:
+        self.visited[:] = self._blank
+
+    def find_guard(self) -> tuple[int, int, int]:
+        for direction, guard in enumerate(DIRECTIONS.encode()):
+            idx = self.cells.find(guard)
+            if idx != -1:
+                i, j = divmod(idx, self.width)
+                return i, j, direction
+
+        raise Exception('Did not find any guard.')
+
+    def is_inside(self, i: int, j: int) -> bool:
+        return 0 <= i < self.height and 0 <= j < self.width
+
+    def is_obstacle(self, i: int, j: int) -> bool:
+        return self.cells[i * self.width + j] == OBSTACLE
+
+    def visit(self, i: int, j: int, direction: int) -> bool:
+        # returns False if the guard already stood here facing this way
+        idx = i * self.width + j
+        bit = 1 << direction
+        if self.visited[idx] & bit:
+            return False
+        self.visited[idx] |= bit
+        return True
+
+    def visited_count(self) -> int:
+        return self.size - self.visited.count(0)
+
+    def visited_cells(self):
+        for idx, mask in enumerate(self.visited):
+            if mask:
+                yield divmod(idx, self.width)
@@ -89,102 +89,59 @@ In this example, the guard will visit 41 distinct positions on your map.
 Predict the path of the guard. How many distinct positions will the guard visit before leaving the mapped area?
 """
 
-GUARDS = {
-    '^',
-    '>',
-    'v',
-    '<',
-}
-
-OBSTACLE = '#'
-MARK = 'X'
+from grid import DIRECTIONS, STEPS, Grid
 
 
 class Solver:
-    def __init__(self, array: list[list]) -> None:
-        self.array = array
-
-    def find_guard(self) -> tuple[int, int, str]:
-        for i, row in enumerate(self.array):
-            for j, cell in enumerate(row):
-                if cell in GUARDS:
-                    return i, j, cell
+    def __init__(self, grid: Grid) -> None:
+        self.grid = grid
 
-        raise Exception('Did not find any guard.')
+    def find_guard(self) -> tuple[int, int, int]:
+        return self.grid.find_guard()
 
     @staticmethod
-    def turn_right(guard: str) -> str:
-        match guard:
-            case '^':
-                return '>'
-            case '>':
-                return 'v'
-            case 'v':
-                return '<'
-            case '<':
-                return '^'
-        raise Exception(f'Wrong guard type `{guard}`.')
+    def turn_right(direction: int) -> int:
+        return (direction + 1) % len(DIRECTIONS)
 
     @staticmethod
-    def get_new_pos(guard: str, i: int, j: int) -> tuple[int, int]:
-        match guard:
-            case '^':
-                return i - 1, j
-            case '>':
-                return i, j + 1
-            case 'v':
-                return i + 1, j
-            case '<':
-                return i, j - 1
-        raise Exception(f'Wrong guard type `{guard}`.')
+    def get_new_pos(direction: int, i: int, j: int) -> tuple[int, int]:
+        di, dj = STEPS[direction]
+        return i + di, j + dj
 
     def is_valid_pos(self, i: int, j: int) -> bool:
-        if i < 0 or j < 0:
+        if not self.grid.is_inside(i, j):
             raise IndexError
-        return self.array[i][j] != OBSTACLE
+        return not self.grid.is_obstacle(i, j)
 
-    def try_move(self, guard: str, i: int, j: int) -> tuple[int, int, str]:
-        starting_guard = guard
+    def try_move(self, direction: int, i: int, j: int) -> tuple[int, int, int]:
+        starting_direction = direction
 
         while True:
-            new_i, new_j = self.get_new_pos(guard, i, j)
+            new_i, new_j = self.get_new_pos(direction, i, j)
             if self.is_valid_pos(new_i, new_j):
-                return new_i, new_j, guard
-            if (guard := self.turn_right(guard)) == starting_guard:
+                return new_i, new_j, direction
+            direction = self.turn_right(direction)
+            if direction == starting_direction:
                 raise Exception
 
-    def mark_guard_steps(self) -> list[list]:
-        new_array = [row.copy() for row in self.array]
-        curr_i, curr_j, guard = self.find_guard()
-        seen_positions: set[tuple[int, int, str]] = set()
-
-        while True:
-            # mark current position
-            new_array[curr_i][curr_j] = MARK
+    def mark_guard_steps(self) -> Grid:
+        self.grid.reset()
+        curr_i, curr_j, direction = self.find_guard()
 
+        # stops once the guard repeats a (position, direction) state
+        while self.grid.visit(curr_i, curr_j, direction):
             # no more moves or new direction
             try:
-                new_i, new_j, guard = self.try_move(guard, curr_i, curr_j)
+                curr_i, curr_j, direction = self.try_move(direction, curr_i, curr_j)
             except Exception:
                 break
 
-            # already seen this position
-            if (new_i, new_j, guard) in seen_positions:
-                break
-
-            # move
-            new_array[new_i][new_j] = guard
-            seen_positions.add((new_i, new_j, guard))
-            curr_i, curr_j = new_i, new_j
-
-        return new_array
+        return self.grid
 
 
 if __name__ == '__main__':
-    lines = map(str.strip, open('./2024/day6/input.txt').readlines())
-    array = [list(line) for line in lines]
+    lines = list(map(str.strip, open('./2024/day6/input.txt').readlines()))
 
-    solver = Solver(array)
-    new_array = solver.mark_guard_steps()
-    mark_count = sum([cell == MARK for row in new_array for cell in row])
-    print(mark_count)  # 5030
+    solver = Solver(Grid.from_lines(lines))
+    grid = solver.mark_guard_steps()
+    print(grid.visited_count())  # 5030
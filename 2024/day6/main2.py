@@ -88,223 +88,311 @@ It doesn't really matter what you choose to use as an obstacle so long as you an
 You need to get the guard stuck in a loop by adding a single new obstruction. How many different positions could you choose for this obstruction?
 """
 
-from itertools import islice
-from tqdm import tqdm
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
 
-
-GUARDS = {
-    '^',
-    '>',
-    'v',
-    '<',
-}
-
-OBSTACLE = '#'
-MARK = 'X'
+from grid import DIRECTIONS, DOWN, LEFT, OBSTACLE, RIGHT, STEPS, UP, Grid
 
 
 class Solver:
-    def __init__(self, array: list[list]) -> None:
-        self.array = array
-
-    @staticmethod
-    def find_guard(array: list[list]) -> tuple[int, int, str]:
-        for i, row in enumerate(array):
-            for j, cell in enumerate(row):
-                if cell in GUARDS:
-                    return i, j, cell
+    def __init__(self, grid: Grid) -> None:
+        self.grid = grid
 
-        raise Exception('Did not find any guard.')
+    def find_guard(self) -> tuple[int, int, int]:
+        return self.grid.find_guard()
 
     @staticmethod
-    def turn_right(guard: str) -> str:
-        match guard:
-            case '^':
-                return '>'
-            case '>':
-                return 'v'
-            case 'v':
-                return '<'
-            case '<':
-                return '^'
-        raise Exception(f'Wrong guard type `{guard}`.')
+    def turn_right(direction: int) -> int:
+        return (direction + 1) % len(DIRECTIONS)
 
     @staticmethod
-    def get_new_pos(guard: str, i: int, j: int) -> tuple[int, int]:
-        match guard:
-            case '^':
-                return i - 1, j
-            case '>':
-                return i, j + 1
-            case 'v':
-                return i + 1, j
-            case '<':
-                return i, j - 1
-        raise Exception(f'Wrong guard type `{guard}`.')
+    def get_new_pos(direction: int, i: int, j: int) -> tuple[int, int]:
+        di, dj = STEPS[direction]
+        return i + di, j + dj
 
     def is_valid_pos(self, i: int, j: int) -> bool:
-        if i < 0 or j < 0:
+        if not self.grid.is_inside(i, j):
             raise IndexError
-        return self.array[i][j] != OBSTACLE
+        return not self.grid.is_obstacle(i, j)
 
-    def try_move(self, guard: str, i: int, j: int) -> tuple[int, int, str]:
-        starting_guard = guard
+    def try_move(self, direction: int, i: int, j: int) -> tuple[int, int, int]:
+        starting_direction = direction
 
         while True:
-            new_i, new_j = self.get_new_pos(guard, i, j)
+            new_i, new_j = self.get_new_pos(direction, i, j)
             if self.is_valid_pos(new_i, new_j):
-                return new_i, new_j, guard
-            if (guard := self.turn_right(guard)) == starting_guard:
+                return new_i, new_j, direction
+            direction = self.turn_right(direction)
+            if direction == starting_direction:
                 raise Exception
 
-    def mark_guard_steps(self) -> list[list]:
-        new_array = [row.copy() for row in self.array]
-        curr_i, curr_j, guard = self.find_guard(self.array)
-        seen_positions: set[tuple[int, int, str]] = set()
-
-        while True:
-            # mark current position
-            new_array[curr_i][curr_j] = MARK
+    def mark_guard_steps(self) -> Grid:
+        self.grid.reset()
+        curr_i, curr_j, direction = self.find_guard()
 
+        # stops once the guard repeats a (position, direction) state
+        while self.grid.visit(curr_i, curr_j, direction):
             # no more moves or new direction
             try:
-                new_i, new_j, guard = self.try_move(guard, curr_i, curr_j)
+                curr_i, curr_j, direction = self.try_move(direction, curr_i, curr_j)
             except Exception:
                 break
 
-            # already seen this position
-            if (new_i, new_j, guard) in seen_positions:
-                break
+        return self.grid
 
-            # move
-            new_array[new_i][new_j] = guard
-            seen_positions.add((new_i, new_j, guard))
-            curr_i, curr_j = new_i, new_j
-
-        return new_array
-
-    def stuck_in_loop(self) -> bool:
-        new_array = [row.copy() for row in self.array]
-        curr_i, curr_j, guard = self.find_guard(new_array)
-        seen_positions: set[tuple[int, int, str]] = set()
-
-        while True:
-            # mark current position
-            new_array[curr_i][curr_j] = MARK
+    def patrol(self) -> list[tuple[int, int, int]]:
+        self.grid.reset()
+        curr_i, curr_j, direction = self.find_guard()
+        states: list[tuple[int, int, int]] = []
 
+        while self.grid.visit(curr_i, curr_j, direction):
+            states.append((curr_i, curr_j, direction))
             try:
-                # get new directions
-                new_i, new_j, guard = self.try_move(guard, curr_i, curr_j)
+                curr_i, curr_j, direction = self.try_move(direction, curr_i, curr_j)
             except Exception:
-                # no more moves
                 break
 
+        return states
+
+    def stuck_in_loop(self, obstruction: tuple[int, int] | None = None) -> bool:
+        # visited buffer is reused, the obstruction is put in place and
+        # removed again instead of copying the map
+        self.grid.reset()
+        curr_i, curr_j, direction = self.find_guard()
+
+        if obstruction is not None:
+            idx = obstruction[0] * self.grid.width + obstruction[1]
+            prev, self.grid.cells[idx] = self.grid.cells[idx], OBSTACLE
+
+        try:
+            while self.grid.visit(curr_i, curr_j, direction):
+                try:
+                    # get new directions
+                    curr_i, curr_j, direction = self.try_move(
+                        direction, curr_i, curr_j
+                    )
+                except IndexError:
+                    # walked off the map
+                    return False
+                except Exception:
+                    # walled in on all four sides, turns in place forever
+                    return True
+
             # already seen this position
-            if (new_i, new_j, guard) in seen_positions:
+            return True
+        finally:
+            if obstruction is not None:
+                self.grid.cells[idx] = prev
+
+
+# unobstructed walk of the guard, an obstruction only changes the path from
+# the first time the guard would step onto it
+class Patrol:
+    def __init__(self, solver: Solver) -> None:
+        width = solver.grid.width
+        self.states = solver.patrol()
+
+        # index of the first time each (cell, direction) state was reached
+        self.first_step = [len(self.states)] * (solver.grid.size * len(DIRECTIONS))
+        self.first_visit: dict[tuple[int, int], int] = {}
+
+        for idx, (i, j, direction) in enumerate(self.states):
+            state = (i * width + j) * len(DIRECTIONS) + direction
+            self.first_step[state] = min(self.first_step[state], idx)
+            self.first_visit.setdefault((i, j), idx)
+
+    def candidates(self) -> list[tuple[int, int]]:
+        # skips the starting position
+        return [pos for pos, idx in self.first_visit.items() if idx > 0]
+
+    def resume_point(self, obstruction: tuple[int, int]) -> tuple[int, int, int, int]:
+        # state right before the guard first reaches the obstruction and the
+        # length of the shared prefix
+        idx = self.first_visit[obstruction]
+        return *self.states[idx - 1], idx
+
+
+# for every cell and direction stores the row (^, v) or column (>, <) of the
+# first obstacle ahead, -1 / height / width means the guard leaves the map
+class JumpTable:
+    def __init__(self, grid: Grid) -> None:
+        self.height = grid.height
+        self.width = grid.width
+        cells = grid.cells
+
+        self.walls = [[0] * grid.size for _ in DIRECTIONS]
+        up, right, down, left = self.walls
+
+        for j in range(self.width):
+            wall = -1
+            for i in range(self.height):
+                if cells[i * self.width + j] == OBSTACLE:
+                    wall = i
+                up[i * self.width + j] = wall
+
+            wall = self.height
+            for i in reversed(range(self.height)):
+                if cells[i * self.width + j] == OBSTACLE:
+                    wall = i
+                down[i * self.width + j] = wall
+
+        for i in range(self.height):
+            wall = -1
+            for j in range(self.width):
+                if cells[i * self.width + j] == OBSTACLE:
+                    wall = j
+                left[i * self.width + j] = wall
+
+            wall = self.width
+            for j in reversed(range(self.width)):
+                if cells[i * self.width + j] == OBSTACLE:
+                    wall = j
+                right[i * self.width + j] = wall
+
+    def stuck_in_loop(
+        self,
+        i: int,
+        j: int,
+        direction: int,
+        obstruction: tuple[int, int],
+        prefix: list[int] | None = None,
+        prefix_len: int = 0,
+    ) -> bool:
+        # extra obstruction is applied as an overlay, the tables stay untouched.
+        # `prefix` maps states to the step they were first reached in the
+        # original patrol, states reached before `prefix_len` count as seen
+        obs_i, obs_j = obstruction
+        up, right, down, left = self.walls
+        seen_turns: set[int] = set()
+
+        while True:
+            if direction == UP:
+                wall = up[i * self.width + j]
+                if j == obs_j and wall < obs_i < i:
+                    wall = obs_i
+                if wall < 0:
+                    return False
+                i = wall + 1
+            elif direction == RIGHT:
+                wall = right[i * self.width + j]
+                if i == obs_i and j < obs_j < wall:
+                    wall = obs_j
+                if wall >= self.width:
+                    return False
+                j = wall - 1
+            elif direction == DOWN:
+                wall = down[i * self.width + j]
+                if j == obs_j and i < obs_i < wall:
+                    wall = obs_i
+                if wall >= self.height:
+                    return False
+                i = wall - 1
+            elif direction == LEFT:
+                wall = left[i * self.width + j]
+                if i == obs_i and wall < obs_j < j:
+                    wall = obs_j
+                if wall < 0:
+                    return False
+                j = wall + 1
+
+            direction = (direction + 1) % len(DIRECTIONS)
+
+            # same cell facing the same way after a turn means a loop
+            state = (i * self.width + j) * len(DIRECTIONS) + direction
+            if state in seen_turns:
+                return True
+            if prefix is not None and prefix[state] < prefix_len:
                 return True
+            seen_turns.add(state)
 
-            # move
-            new_array[new_i][new_j] = guard
-            seen_positions.add((new_i, new_j, guard))
-            curr_i, curr_j = new_i, new_j
-
-        return False
-
-
-def find_obstacle(
-    array: list[list[str]], pos: tuple[int, int], dir: str
-) -> tuple[int, int] | None:
-    i, j = pos
-    if not (0 <= i < len(array)):
-        return None
-    if not (0 <= j < len(array[i])):
-        return None
-
-    match dir:
-        case '>':
-            col_idx = j + 1
-            while col_idx < len(array[i]):
-                if array[i][col_idx] == OBSTACLE:
-                    return i, col_idx - 1
-                col_idx += 1
-            return None
-        case '<':
-            col_idx = j - 1
-            while col_idx >= 0:
-                if array[i][col_idx] == OBSTACLE:
-                    return i, col_idx + 1
-                col_idx -= 1
-            return None
-        case '^':
-            row_idx = i - 1
-            while row_idx >= 0:
-                if array[row_idx][j] == OBSTACLE:
-                    return row_idx + 1, j
-                row_idx -= 1
-            return None
-        case 'v':
-            row_idx = i + 1
-            while row_idx < len(array):
-                if array[row_idx][j] == OBSTACLE:
-                    return row_idx - 1, j
-                row_idx += 1
-            return None
-        case _:
-            raise Exception
-
-
-def is_valid_candidate(array: list[list[str]], i: int, j: int) -> bool:
-    # upper left
-    if new_pos := find_obstacle(array, (i + 1, j), '>'):
-        if new_pos := find_obstacle(array, new_pos, 'v'):
-            if new_pos := find_obstacle(array, new_pos, '<'):
-                if new_pos[1] == j:
-                    return True
 
-    # upper right
-    if new_pos := find_obstacle(array, (i, j - 1), 'v'):
-        if new_pos := find_obstacle(array, new_pos, '<'):
-            if new_pos := find_obstacle(array, new_pos, '^'):
-                if new_pos[0] == i:
-                    return True
-    # lower left
-    if new_pos := find_obstacle(array, (i, j + 1), '^'):
-        if new_pos := find_obstacle(array, new_pos, '>'):
-            if new_pos := find_obstacle(array, new_pos, 'v'):
-                if new_pos[0] == i:
-                    return True
+# per-process state, filled once by `_init_worker`
+_worker_table: JumpTable | None = None
+_worker_patrol: Patrol | None = None
 
-    # lower right
-    if new_pos := find_obstacle(array, (i - 1, j), '<'):
-        if new_pos := find_obstacle(array, new_pos, '^'):
-            if new_pos := find_obstacle(array, new_pos, '>'):
-                if new_pos[1] == j:
-                    return True
 
-    return False
+def _init_worker(shm_name: str, height: int, width: int) -> None:
+    global _worker_table, _worker_patrol
 
+    shm = SharedMemory(name=shm_name)
+    try:
+        grid = Grid(bytes(shm.buf[: height * width]), width)
+    finally:
+        shm.close()
 
-if __name__ == '__main__':
-    lines = map(str.strip, open('./2024/day6/input.txt').readlines())
-    array = [list(line) for line in lines]
+    _worker_table = JumpTable(grid)
+    _worker_patrol = Patrol(Solver(grid))
 
-    solver = Solver(array)
-    start_i, start_j, _ = solver.find_guard(solver.array)
 
-    candidates = [
-        (i, j)
-        for i, row in enumerate(solver.mark_guard_steps())
-        for j, cell in enumerate(row)
-        if cell == MARK and (start_i, start_j) != (i, j)
-    ]
+def _count_chunk(chunk: list[tuple[int, int]]) -> int:
+    return count_chunk(_worker_table, _worker_patrol, chunk)
 
+
+def count_chunk(
+    table: JumpTable, patrol: Patrol, chunk: list[tuple[int, int]]
+) -> int:
     count = 0
-    new_array = [row[:] for row in array]
-    for i, j in tqdm(candidates):
-        prev = new_array[i][j]
-        if is_valid_candidate(new_array, i, j):
-            new_array[i][j] = OBSTACLE
-            count += Solver(new_array).stuck_in_loop()
-        new_array[i][j] = prev
+    for candidate in chunk:
+        i, j, direction, prefix_len = patrol.resume_point(candidate)
+        count += table.stuck_in_loop(
+            i, j, direction, candidate, patrol.first_step, prefix_len
+        )
+    return count
+
+
+def count_loops(
+    grid: Grid,
+    patrol: Patrol,
+    candidates: list[tuple[int, int]],
+    workers: int = 1,
+    chunk_size: int = 256,
+) -> int:
+    if workers <= 1 or len(candidates) <= chunk_size:
+        return count_chunk(JumpTable(grid), patrol, candidates)
+
+    # grid goes to the workers once through shared memory, tasks only carry
+    # candidate coordinates
+    try:
+        shm = SharedMemory(create=True, size=grid.size)
+    except OSError:
+        return count_loops(grid, patrol, candidates, workers=1)
+
+    try:
+        shm.buf[: grid.size] = grid.cells
+        chunks = [
+            candidates[idx : idx + chunk_size]
+            for idx in range(0, len(candidates), chunk_size)
+        ]
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(shm.name, grid.height, grid.width),
+        ) as pool:
+            return sum(pool.map(_count_chunk, chunks))
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '-w', '--workers', type=int, default=1, help=f'1 - {os.cpu_count()}'
+    )
+    args = parser.parse_args()
+
+    lines = list(map(str.strip, open('./2024/day6/input.txt').readlines()))
+
+    solver = Solver(Grid.from_lines(lines))
+    patrol = Patrol(solver)
+    candidates = patrol.candidates()
+
+    start = time.perf_counter()
+    count = count_loops(solver.grid, patrol, candidates, args.workers)
+    elapsed = time.perf_counter() - start
 
     print(count)  # 1928
+    print(f'{len(candidates) / elapsed:.0f} candidates/s ({elapsed:.6f} s)')
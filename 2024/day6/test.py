@@ -0,0 +1,42 @@
+import random
+
+from grid import Grid
+from main2 import JumpTable, Patrol, Solver, count_chunk
+
+
+def stuck_in_loop(lines: list[str], obstruction: tuple[int, int]) -> tuple[bool, bool]:
+    grid = Grid.from_lines(lines)
+    solver = Solver(grid)
+    i, j, direction = solver.find_guard()
+    return (
+        solver.stuck_in_loop(obstruction),
+        JumpTable(grid).stuck_in_loop(i, j, direction, obstruction),
+    )
+
+
+def test_walled_in():
+    lines = ['...', '...', '.#.', '#v#', '...', '...']
+    assert stuck_in_loop(lines, (4, 1)) == (True, True)
+
+
+def test_engines_agree():
+    rng = random.Random(6)
+    for _ in range(400):
+        height, width = rng.randint(3, 8), rng.randint(3, 8)
+        cells = [rng.choice('#....') for _ in range(height * width)]
+        cells[rng.randrange(height * width)] = rng.choice('^>v<')
+        lines = [
+            ''.join(cells[row * width : (row + 1) * width]) for row in range(height)
+        ]
+
+        grid = Grid.from_lines(lines)
+        solver = Solver(grid)
+        patrol = Patrol(solver)
+        candidates = patrol.candidates()
+
+        expected = sum(solver.stuck_in_loop(candidate) for candidate in candidates)
+        assert count_chunk(JumpTable(grid), patrol, candidates) == expected, lines
+
+        for obstruction in candidates:
+            a, b = stuck_in_loop(lines, obstruction)
+            assert a == b, (lines, obstruction)
@@ -0,0 +1,64 @@
+"""
+Micro-benchmark of the `||` operator: the old log10 based `calc` against the
+integer multiply-add with shifts precomputed at parse time.
+"""
+
+import math
+import random
+import timeit
+
+from main2 import calc, get_shifts
+
+
+def calc_log10(a: int, b: int) -> int:
+    return a * (10 ** (math.floor(math.log10(b) + 1))) + b
+
+
+def check_edges() -> None:
+    # log10 of numbers just below a power of ten rounds up to it
+    wrong = []
+    for digits in range(1, 40):
+        for b in (10 ** (digits - 1), 10**digits - 1):
+            expected = int(f'1{b}')
+            assert calc(1, b, '||') == expected
+            if calc_log10(1, b) != expected:
+                wrong.append(b)
+
+    if wrong:
+        print(f'log10 wrong for {len(wrong)} edge values, first: 1 || {wrong[0]}')
+
+
+def main():
+    random.seed(7)
+    pairs = [
+        (random.randint(1, 10**12), random.randint(1, 999)) for _ in range(100_000)
+    ]
+    shifts = get_shifts([b for _, b in pairs])
+    number = 20
+
+    timings = {
+        'log10 calc': lambda: [calc_log10(a, b) for a, b in pairs],
+        'shift calc': lambda: [
+            calc(a, b, '||', shift)
+            for (a, b), shift in zip(pairs, shifts, strict=True)
+        ],
+        'inline': lambda: [
+            a * shift + b for (a, b), shift in zip(pairs, shifts, strict=True)
+        ],
+    }
+
+    calls = len(pairs) * number
+    baseline = None
+    for name, func in timings.items():
+        elapsed = timeit.timeit(func, number=number)
+        baseline = baseline or elapsed
+        print(
+            f'{name:<12} {elapsed / calls * 1e9:7.1f} ns/op '
+            f'({baseline / elapsed:.1f}x)'
+        )
+
+    check_edges()
+
+
+if __name__ == '__main__':
+    main()
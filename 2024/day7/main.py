@@ -35,30 +35,6 @@ import re
 import time
 
 
-class Product:
-    def __init__(self, a: str, b: str, length: int) -> None:
-        self.a = a
-        self.b = b
-        self.length = length
-        self._flags = (2**self.length) - 1
-
-    def _is_overflow(self) -> bool:
-        return self._flags < 0
-
-    def next(self) -> list[str] | None:
-        if self._is_overflow():
-            return None
-
-        output = [
-            self.a if (self._flags & (1 << i)) != 0 else self.b
-            for i in range(self.length)
-        ]
-
-        self._flags -= 1
-
-        return output
-
-
 def is_line_valid(line: str) -> None | int:
     s = None
     nums = []
@@ -73,37 +49,34 @@ def is_line_valid(line: str) -> None | int:
             continue
         nums.append(num)
 
-    # for perm in product(('+', '*'), repeat=(len(nums) - 1)):
-    #     test_sum = calc_equation(nums, perm)
-    #     if test_sum == s:
-    #         return s
-    op_iter = Product('+', '*', len(nums) - 1)
-    while (perm := op_iter.next()) is not None:
-        test_sum = calc_equation(nums, perm)
-        if test_sum == s:
-            return s
+    if can_be_true(s, nums):
+        return s
 
     return None
 
 
-def calc_equation(nums: list[int], operations: list[str]) -> int:
-    assert len(nums) - 1 == len(operations)
-
-    s = nums[0]
+def can_be_true(expected_sum: int, nums: list[int], idx: int | None = None) -> bool:
+    # works back from the result, undoing the last operator only when the
+    # inverse is exact: subtraction stays >= 0 and division has no remainder
+    if idx is None:
+        idx = len(nums) - 1
 
-    for num, op in zip(nums[1:], operations, strict=True):
-        s = calc(s, num, op)
+    num = nums[idx]
+    if idx == 0:
+        return expected_sum == num
 
-    return s
+    if expected_sum >= num and can_be_true(expected_sum - num, nums, idx - 1):
+        return True
 
+    if num == 0:
+        # anything times 0 is 0
+        if expected_sum == 0:
+            return True
+    elif expected_sum % num == 0:
+        if can_be_true(expected_sum // num, nums, idx - 1):
+            return True
 
-def calc(a: int, b: int, operation: str) -> int:
-    match operation:
-        case '+':
-            return a + b
-        case '*':
-            return a * b
-    raise Exception
+    return False
 
 
 def main():
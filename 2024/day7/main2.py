@@ -14,52 +14,201 @@ Adding up all six test values (the three that could be made before using only +
 Using your new knowledge of elephant hiding spots, determine which equations could possibly be true. What is their total calibration result?
 """
 
+import argparse
 import itertools
-import math
-
-from tqdm import tqdm
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
 
 
 OPERATORS = ['+', '*', '||']
 
 
-def is_line_valid(line: str) -> int:
-    lhs, rhs = line.split(':')
-    expected_sum = int(lhs)
+Solver = Callable[[int, list[int], list[int]], bool]
+
 
-    nums = list(map(int, rhs.split()))
-    for prod in itertools.product(OPERATORS, repeat=len(nums) - 1):
-        if expected_sum == eval_eq(nums, prod):
-            return expected_sum
+def is_line_valid(line: str, solver: Solver | None = None) -> int:
+    solver = solver or can_be_true
+    expected_sum, nums = parse_line(line)
+    if solver(expected_sum, nums, get_shifts(nums)):
+        return expected_sum
     return 0
 
 
-def eval_eq(nums: list[int], operations: list[str]) -> int:
+def parse_line(line: str) -> tuple[int, list[int]]:
+    lhs, rhs = line.split(':')
+    return int(lhs), list(map(int, rhs.split()))
+
+
+def concat_shift(num: int) -> int:
+    # power of ten with `a || num == a * shift + num`, integer only so it
+    # stays exact for any size (log10 rounds up just below powers of ten)
+    shift = 10
+    while shift <= num:
+        shift *= 10
+    return shift
+
+
+def get_shifts(nums: list[int]) -> list[int]:
+    return [concat_shift(num) for num in nums]
+
+
+def can_be_true(
+    expected_sum: int, nums: list[int], shifts: list[int] | None = None
+) -> bool:
+    shifts = shifts or get_shifts(nums)
+    return _can_be_true(expected_sum, nums, shifts, len(nums) - 1)
+
+
+def _can_be_true(
+    expected_sum: int, nums: list[int], shifts: list[int], idx: int
+) -> bool:
+    # works back from the result, undoing the last operator only when the
+    # inverse is exact: subtraction stays >= 0, division has no remainder
+    # and un-concatenation strips a matching suffix
+    num = nums[idx]
+    if idx == 0:
+        return expected_sum == num
+
+    if expected_sum >= num:
+        if _can_be_true(expected_sum - num, nums, shifts, idx - 1):
+            return True
+
+    if num == 0:
+        # anything times 0 is 0
+        if expected_sum == 0:
+            return True
+    elif expected_sum % num == 0:
+        if _can_be_true(expected_sum // num, nums, shifts, idx - 1):
+            return True
+
+    shift = shifts[idx]
+    if expected_sum > num and expected_sum % shift == num:
+        if _can_be_true(expected_sum // shift, nums, shifts, idx - 1):
+            return True
+
+    return False
+
+
+def can_reach(
+    expected_sum: int, nums: list[int], shifts: list[int] | None = None
+) -> bool:
+    # every partial result reachable after each number, operator strings
+    # sharing a prefix share its value. With positive numbers no operator
+    # makes a value smaller, so anything above the target is dropped
+    shifts = shifts or get_shifts(nums)
+    prune = min(nums) > 0
+    reachable = {nums[0]}
+
+    for num, shift in zip(nums[1:], shifts[1:]):
+        reachable = {
+            result
+            for value in reachable
+            for result in (value + num, value * num, value * shift + num)
+            if not prune or result <= expected_sum
+        }
+        if not reachable:
+            return False
+
+    return expected_sum in reachable
+
+
+def eval_eq(
+    nums: list[int], operations: list[str], shifts: list[int] | None = None
+) -> int:
     assert len(nums) - 1 == len(operations)
 
+    shifts = shifts or get_shifts(nums)
     result = nums[0]
-    for num, op in zip(itertools.islice(nums, 1, None), operations, strict=True):
-        result = calc(result, num, op)
+    for num, shift, op in zip(nums[1:], shifts[1:], operations, strict=True):
+        result = calc(result, num, op, shift)
     return result
 
 
-def calc(a: int, b: int, op: str) -> int:
+def calc(a: int, b: int, op: str, shift: int | None = None) -> int:
     match op:
         case '+':
             return a + b
         case '*':
             return a * b
         case '||':
-            return a * (10 ** (math.floor(math.log10(b) + 1))) + b
+            return a * (shift or concat_shift(b)) + b
     raise Exception
 
 
+SOLVERS = {
+    'reverse': can_be_true,
+    'forward': can_reach,
+}
+
+
+def timed_line(line: str, solver: str = 'reverse') -> tuple[int, float]:
+    start = time.perf_counter()
+    result = is_line_valid(line, SOLVERS[solver])
+    return result, time.perf_counter() - start
+
+
+def run_lines(
+    lines: list[str], workers: int = 1, solver: str = 'reverse'
+) -> list[tuple[int, float]]:
+    if workers <= 1:
+        return [timed_line(line, solver) for line in lines]
+
+    # longest operand lists first, so the slowest lines don't start last
+    order = sorted(range(len(lines)), key=lambda idx: -len(lines[idx].split()))
+    results: list[tuple[int, float]] = [(0, 0.0)] * len(lines)
+
+    chunksize = max(1, len(lines) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        timed = pool.map(
+            timed_line,
+            [lines[idx] for idx in order],
+            itertools.repeat(solver),
+            chunksize=chunksize,
+        )
+        for idx, result in zip(order, timed):
+            results[idx] = result
+
+    return results
+
+
+def print_timing_report(
+    lines: list[str], results: list[tuple[int, float]], top: int = 10
+) -> None:
+    total = sum(elapsed for _, elapsed in results)
+    costliest = sorted(range(len(lines)), key=lambda idx: -results[idx][1])
+
+    print(f'\n{top} costliest of {len(lines)} lines ({total:.6f} s in total):')
+    for idx in costliest[:top]:
+        result, elapsed = results[idx]
+        share = elapsed / total if total else 0
+        valid = 'valid' if result else 'invalid'
+        print(f'{elapsed:.6f} s {share:6.1%} {valid:>7}  #{idx + 1}: {lines[idx]}')
+
+
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '-w', '--workers', type=int, default=1, help=f'1 - {os.cpu_count()}'
+    )
+    parser.add_argument(
+        '--report', type=int, default=0, metavar='N', help='show N slowest lines'
+    )
+    parser.add_argument('--solver', choices=SOLVERS, default='reverse')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
     with open('./2024/day7/input.txt') as file:
         lines = file.readlines()
         lines = list(map(str.strip, lines))
-        result = sum([is_line_valid(line) for line in tqdm(lines)])
-        print(result)  # 34612812972206
+
+    results = run_lines(lines, args.workers, args.solver)
+    print(sum(result for result, _ in results))  # 34612812972206
+    print(f'Done in {time.perf_counter() - start:.6f} s')
+
+    if args.report:
+        print_timing_report(lines, results, args.report)
 
 
 if __name__ == '__main__':
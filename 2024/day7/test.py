@@ -0,0 +1,46 @@
+import itertools
+import random
+
+import main
+import main2
+
+
+def brute_force(expected_sum: int, nums: list[int], operators: list[str]) -> bool:
+    return any(
+        main2.eval_eq(nums, list(operations)) == expected_sum
+        for operations in itertools.product(operators, repeat=len(nums) - 1)
+    )
+
+
+def random_lines(seed: int, operators: list[str]):
+    rng = random.Random(seed)
+    for _ in range(3000):
+        nums = [rng.randint(0, 12) for _ in range(rng.randint(1, 5))]
+        if rng.random() < 0.5:
+            # a reachable target, otherwise mostly unreachable ones
+            operations = rng.choices(operators, k=len(nums) - 1)
+            expected_sum = main2.eval_eq(nums, operations)
+        else:
+            expected_sum = rng.randint(0, 200)
+        yield expected_sum, nums
+
+
+def test_zero_operand():
+    assert main.can_be_true(0, [4, 1, 6, 2, 0])
+    assert main2.can_be_true(0, [4, 1, 6, 2, 0])
+    assert main2.can_reach(0, [4, 1, 6, 2, 0])
+
+
+def test_part1_matches_brute_force():
+    operators = ['+', '*']
+    for expected_sum, nums in random_lines(1, operators):
+        assert main.can_be_true(expected_sum, nums) == brute_force(
+            expected_sum, nums, operators
+        ), (expected_sum, nums)
+
+
+def test_part2_matches_brute_force():
+    for expected_sum, nums in random_lines(2, main2.OPERATORS):
+        expected = brute_force(expected_sum, nums, main2.OPERATORS)
+        assert main2.can_be_true(expected_sum, nums) == expected, (expected_sum, nums)
+        assert main2.can_reach(expected_sum, nums) == expected, (expected_sum, nums)
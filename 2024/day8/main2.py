@@ -38,11 +38,12 @@ Calculate the impact of the signal using this updated model. How many unique loc
 """
 
 import itertools
-from pprint import pprint
+import math
 from typing import TypeAlias
 
 
 Point: TypeAlias = tuple[int, int]
+Line: TypeAlias = tuple[int, int, int]
 
 
 def is_antenna(letter: str) -> bool:
@@ -51,47 +52,51 @@ def is_antenna(letter: str) -> bool:
     return letter.isalnum()
 
 
-def get_line_endpoint(start: Point, middle: Point) -> Point:
-    start_x, start_y = start
-    middle_x, middle_y = middle
+def get_line(point1: Point, point2: Point) -> tuple[Line, Point]:
+    # direction reduced by its gcd so no lattice point is skipped, sign fixed
+    # so both pair orders give the same key, offset tells parallel lines apart
+    x1, y1 = point1
+    dx, dy = point2[0] - x1, point2[1] - y1
+    divisor = math.gcd(dx, dy)
+    dx, dy = dx // divisor, dy // divisor
+    if dx < 0 or (dx == 0 and dy < 0):
+        dx, dy = -dx, -dy
 
-    end_x = 2 * middle_x - start_x
-    end_y = 2 * middle_y - start_y
+    return (dx, dy, dx * y1 - dy * x1), (dx, dy)
 
-    return end_x, end_y
 
+def mark_line(
+    bitmap: bytearray, width: int, height: int, point: Point, step: Point
+) -> None:
+    x, y = point
+    dx, dy = step
 
-def calc_antinodes(array: list[list[str]], point1: Point, point2: Point) -> set[Point]:
-    output = {point1, point2}
+    # walk back to the first cell of the line on the map
+    while 0 <= x - dx < height and 0 <= y - dy < width:
+        x, y = x - dx, y - dy
 
-    left, middle = point1, point2
-    while True:
-        right = get_line_endpoint(left, middle)
-        if not is_valid_index(array, right):
-            break
-        output.add(right)
-        left, middle = middle, right
+    while 0 <= x < height and 0 <= y < width:
+        bitmap[x * width + y] = 1
+        x, y = x + dx, y + dy
 
-    left, middle = point2, point1
-    while True:
-        right = get_line_endpoint(left, middle)
-        if not is_valid_index(array, right):
-            break
-        output.add(right)
-        left, middle = middle, right
 
-    return output
+def count_harmonic_antinodes(
+    array: list[list[str]], antennas: dict[str, list[Point]]
+) -> int:
+    height, width = len(array), len(array[0])
+    bitmap = bytearray(height * width)
+    lines: set[Line] = set()
 
+    for locations in antennas.values():
+        for p1, p2 in itertools.combinations(locations, r=2):
+            line, step = get_line(p1, p2)
+            # collinear antennas share a line, walk it only once
+            if line in lines:
+                continue
+            lines.add(line)
+            mark_line(bitmap, width, height, p1, step)
 
-def is_valid_index(array: list[list[str]], antinode: Point) -> bool:
-    x, y = antinode
-
-    if not (0 <= x < len(array)):
-        return False
-    if not (0 <= y < len(array[x])):
-        return False
-
-    return True
+    return len(bitmap) - bitmap.count(0)
 
 
 def print_map(array):
@@ -110,23 +115,7 @@ def main():
             if is_antenna(cell):
                 antennas.setdefault(cell, list()).append((i, j))
 
-    antinodes: set[Point] = set()
-    for locations in antennas.values():
-        pairs = itertools.combinations(locations, r=2)
-        for p1, p2 in pairs:
-            antinodes.update(calc_antinodes(array, p1, p2))
-
-    pprint(antinodes)
-
-    for i, row in enumerate(array):
-        for j, col in enumerate(row):
-            if col == '.' and (i, j) in antinodes:
-                print('#', end='')
-            else:
-                print(col, end='')
-        print()
-
-    print(len(antinodes))  # 376
+    print(count_harmonic_antinodes(array, antennas))  # 1352
 
 
 if __name__ == '__main__':
@@ -0,0 +1,113 @@
+"""
+NumPy version of both parts: every frequency becomes an (n, 2) array of
+antenna coordinates, all pairs are handled at once and antinodes are marked
+in a boolean occupancy grid.
+"""
+
+import time
+
+import numpy as np
+
+
+def load_antennas(lines: list[str]) -> tuple[tuple[int, int], dict[str, np.ndarray]]:
+    grid = np.array([list(line) for line in lines], dtype='U1')
+
+    antennas: dict[str, np.ndarray] = {}
+    for letter in np.unique(grid):
+        if letter.isalnum():
+            antennas[str(letter)] = np.argwhere(grid == letter)
+
+    return grid.shape, antennas
+
+
+def get_pairs(locations: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    first, second = np.triu_indices(len(locations), k=1)
+    return locations[first], locations[second]
+
+
+def mark(occupied: np.ndarray, points: np.ndarray) -> None:
+    height, width = occupied.shape
+    inside = (
+        (points[:, 0] >= 0)
+        & (points[:, 0] < height)
+        & (points[:, 1] >= 0)
+        & (points[:, 1] < width)
+    )
+    occupied[points[inside, 0], points[inside, 1]] = True
+
+
+def find_antinodes(
+    shape: tuple[int, int], antennas: dict[str, np.ndarray]
+) -> np.ndarray:
+    occupied = np.zeros(shape, dtype=bool)
+
+    for locations in antennas.values():
+        p1, p2 = get_pairs(locations)
+        # P1 ---- P2 ---- unknown and P2 ---- P1 ---- unknown
+        mark(occupied, 2 * p2 - p1)
+        mark(occupied, 2 * p1 - p2)
+
+    return occupied
+
+
+def _step_range(start: np.ndarray, step: np.ndarray, size: int) -> tuple:
+    # smallest and largest t with 0 <= start + t * step < size, any t for 0
+    low = np.full(start.shape, np.iinfo(np.int64).min // 4)
+    high = np.full(start.shape, np.iinfo(np.int64).max // 4)
+
+    pos = step > 0
+    low[pos] = -(start[pos] // step[pos])
+    high[pos] = (size - 1 - start[pos]) // step[pos]
+
+    neg = step < 0
+    low[neg] = -((size - 1 - start[neg]) // -step[neg])
+    high[neg] = start[neg] // -step[neg]
+
+    return low, high
+
+
+def find_harmonic_antinodes(
+    shape: tuple[int, int], antennas: dict[str, np.ndarray]
+) -> np.ndarray:
+    height, width = shape
+    occupied = np.zeros(shape, dtype=bool)
+
+    for locations in antennas.values():
+        if len(locations) < 2:
+            continue
+
+        p1, p2 = get_pairs(locations)
+        step = p2 - p1
+        step //= np.gcd(step[:, 0], step[:, 1])[:, None]
+
+        row_low, row_high = _step_range(p1[:, 0], step[:, 0], height)
+        col_low, col_high = _step_range(p1[:, 1], step[:, 1], width)
+        low = np.maximum(row_low, col_low)
+        counts = np.minimum(row_high, col_high) - low + 1
+
+        # every multiple of the reduced step that stays on the map
+        offsets = np.arange(counts.sum()) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        t = np.repeat(low, counts) + offsets
+        points = np.repeat(p1, counts, axis=0) + t[:, None] * np.repeat(
+            step, counts, axis=0
+        )
+        occupied[points[:, 0], points[:, 1]] = True
+
+    return occupied
+
+
+def main():
+    start = time.perf_counter_ns()
+
+    lines = open('./2024/day8/input.txt').read().replace('\r', '').splitlines()
+    shape, antennas = load_antennas([line.rstrip() for line in lines])
+
+    print(find_antinodes(shape, antennas).sum())  # 376
+    print(find_harmonic_antinodes(shape, antennas).sum())  # 1352
+    print(f'Found in {(time.perf_counter_ns() - start) / 1_000_000_000:0.6f} s')
+
+
+if __name__ == '__main__':
+    main()
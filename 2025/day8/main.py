@@ -1,8 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import argparse
+import heapq
+import itertools
+import math
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
 from typing import NamedTuple
 
+import numpy as np
+
 data = """
 162,817,812
 57,618,57
@@ -38,60 +46,273 @@ class Point(NamedTuple):
         return Point(int(x), int(y), int(z))
 
     def distance(self, other: Point) -> float:
-        s = (self.x - other.x) ** 2 + (self.y - other.y) ** 2 + (self.z - other.z) ** 2
-        return (s) ** 0.5
+        return self.squared_distance(other) ** 0.5
 
+    def squared_distance(self, other: Point) -> int:
+        return (
+            (self.x - other.x) ** 2 + (self.y - other.y) ** 2 + (self.z - other.z) ** 2
+        )
 
-@dataclass
-class Circut:
-    points: list[Point]
 
+class DisjointSet:
+    def __init__(self, size: int) -> None:
+        self.parent = list(range(size))
+        self.rank = [0] * size
+        self.sizes = [1] * size
+        self.count = size
 
-def find(circuts: list[Circut], point: Point) -> Circut:
-    for circut in circuts:
-        if point in circut.points:
-            return circut
+    def find(self, item: int) -> int:
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
 
-    assert False
+        # path compression
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
 
-def main() -> None:
-    points = [Point.parse(line) for line in data.splitlines()]
-    circuts = [Circut([point]) for point in points]
+        return root
 
-    stack: list[tuple[Point, Point]] = []
-    for p1 in points:
-        for p2 in points:
-            if p1 == p2:
-                continue
+    def union(self, a: int, b: int) -> bool:
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+
+        # union by rank
+        if self.rank[a] < self.rank[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.sizes[a] += self.sizes[b]
+        if self.rank[a] == self.rank[b]:
+            self.rank[a] += 1
+
+        self.count -= 1
+        return True
+
+    def component_sizes(self) -> list[int]:
+        return [self.sizes[i] for i in range(len(self.parent)) if self.parent[i] == i]
+
+
+Edge = tuple[int, int, int]
+
+
+def _pairs_within(
+    points: list[Point], cell: int, groups: list[int] | None = None
+) -> Iterator[Edge]:
+    # pairs in the same or a neighbouring grid bucket of `cell` width, which
+    # covers every pair closer than the width. Pairs with the same group are
+    # left out, whole bucket pairs at once when both hold just that group
+    buckets: dict[tuple[int, int, int], list[int]] = {}
+    for idx, (x, y, z) in enumerate(points):
+        buckets.setdefault((x // cell, y // cell, z // cell), []).append(idx)
 
-            if (p1, p2) in stack or (p2, p1) in stack:
+    labels: dict[tuple[int, int, int], set[int]] = {}
+    if groups is not None:
+        labels = {
+            key: {groups[i] for i in members} for key, members in buckets.items()
+        }
+
+    offsets = list(itertools.product((-1, 0, 1), repeat=3))
+    for (cx, cy, cz), members in buckets.items():
+        for dx, dy, dz in offsets:
+            key = (cx + dx, cy + dy, cz + dz)
+            # every pair of buckets once
+            if key < (cx, cy, cz) or key not in buckets:
                 continue
+            if groups is not None:
+                own, other = labels[(cx, cy, cz)], labels[key]
+                if len(own) == 1 and own == other:
+                    continue
+            others = buckets[key]
+            same = key == (cx, cy, cz)
+            for a_pos, a in enumerate(members):
+                x, y, z = points[a]
+                for b in others[a_pos + 1 :] if same else others:
+                    if groups is not None and groups[a] == groups[b]:
+                        continue
+                    x2, y2, z2 = points[b]
+                    d = (x - x2) ** 2 + (y - y2) ** 2 + (z - z2) ** 2
+                    yield (d, a, b) if a < b else (d, b, a)
+
+
+def iter_edges(
+    points: list[Point],
+    batch: int | None = None,
+    groups: Callable[[], list[int]] | None = None,
+) -> Iterator[Edge]:
+    # all pairs as (squared distance, i, j) in ascending order, produced shell
+    # by shell. Each radius is picked from the edge density of the previous
+    # shell to hold about `batch` new pairs, so only one shell is held at a
+    # time. `groups` gives a label per point before every shell, pairs with
+    # equal labels are skipped
+    if len(points) < 2:
+        return
+
+    batch = batch or len(points)
+    spans = [max(axis) - min(axis) + 1 for axis in zip(*points)]
+    volume = math.prod(spans)
+    max_distance = sum(span**2 for span in spans)
+
+    # first guess for uniformly spread points, clusters and outliers are
+    # corrected by the shells that follow
+    pairs = len(points) * (len(points) - 1) / 2
+    ball = 3 * volume * 2 * batch / (4 * math.pi * pairs)
+    radius = max(1, math.ceil(ball ** (1 / 3)))
+    done_radius = 0
+    done = -1
+
+    while done < max_distance:
+        limit = radius**2
+        shell: list[Edge] = []
+        # closest pair seen past the shell
+        beyond = max_distance + 1
+        dense = False
+        for edge in _pairs_within(points, radius, groups() if groups else None):
+            if edge[0] > limit:
+                if edge[0] < beyond:
+                    beyond = edge[0]
+            elif edge[0] > done:
+                shell.append(edge)
+                if len(shell) > 8 * batch and radius > done_radius + 1:
+                    dense = True
+                    break
+
+        if dense:
+            # far denser than estimated, retry with a thinner shell
+            radius = done_radius + (radius - done_radius) // 2
+            continue
+
+        found = len(shell)
+        heapq.heapify(shell)
+        while shell:
+            yield heapq.heappop(shell)
+
+        if found:
+            # same pair density as in this shell, scaled to `batch` pairs
+            cube = radius**3 + (radius**3 - done_radius**3) * batch / found
+            next_radius = math.ceil(cube ** (1 / 3))
+        elif beyond <= max_distance:
+            # empty range, jump straight to the closest pair seen past it
+            next_radius = math.isqrt(beyond - 1) + 1
+        else:
+            next_radius = 2 * radius
 
-            stack.append((p1, p2))
-    stack.sort(key=lambda pair: pair[0].distance(pair[1]))
+        done_radius, done = radius, limit
+        radius = max(radius + 1, next_radius)
 
-    counter = 0
-    for p1, p2 in stack:
-        if counter == 10:
-            break
 
-        c1 = find(circuts, p1)
-        c2 = find(circuts, p2)
+def connect(points: list[Point], connections: int) -> DisjointSet:
+    circuits = DisjointSet(len(points))
+    for _, i, j in itertools.islice(iter_edges(points, connections), connections):
+        circuits.union(i, j)
+    return circuits
 
-        if c1 != c2:
-            # merge circuts
-            c1.points.extend(c2.points)
-            circuts.remove(c2)
 
-        counter += 1
+def connect_all(points: list[Point]) -> tuple[int, int] | None:
+    # Kruskal on the lazily produced edges, stops at the edge that joins the
+    # last two circuits
+    circuits = DisjointSet(len(points))
 
-    circuts.sort(key=lambda x: -len(x.points))
-    for c in circuts:
-        print(c)
+    # pairs inside one circuit can't join anything, so they are not scanned
+    def roots() -> list[int]:
+        return [circuits.find(i) for i in range(len(points))]
 
-    print(
-        f'result: "{len(circuts[0].points) * len(circuts[1].points) * len(circuts[2].points)}"'
+    for _, i, j in iter_edges(points, groups=roots):
+        if circuits.union(i, j) and circuits.count == 1:
+            return i, j
+    return None
+
+
+def closest_edges_numpy(
+    coords: np.ndarray, k: int, block_elements: int = 1 << 22
+) -> np.ndarray:
+    # (k, 3) array of (squared distance, i, j) with i < j, smallest first.
+    # Distances are computed for a few rows at a time so a block holds about
+    # `block_elements` of them no matter how many points there are
+    n = len(coords)
+    k = min(k, n * (n - 1) // 2)
+    best = np.empty((0, 3), dtype=np.int64)
+    if k <= 0:
+        return best
+
+    rows = max(1, block_elements // max(n, 1))
+    limit = np.iinfo(np.int64).max
+
+    for start in range(0, n - 1, rows):
+        stop = min(start + rows, n - 1)
+        # row `start + r` against columns `start + 1 + c`
+        diff = coords[start:stop, None, :] - coords[None, start + 1 :, :]
+        dist = np.einsum('ijk,ijk->ij', diff, diff)
+
+        # upper triangle only, every pair once
+        upper = np.arange(dist.shape[1]) >= np.arange(stop - start)[:, None]
+        r, c = np.nonzero(upper & (dist < limit if len(best) < k else dist <= limit))
+        block = np.column_stack((dist[r, c], r + start, c + start + 1))
+
+        candidates = np.concatenate((best, block))
+        if len(candidates) > k:
+            # partial selection, ties at the k-th distance go by (i, j) like in
+            # the exact ordering of `iter_edges`
+            kth = np.partition(candidates[:, 0], k - 1)[k - 1]
+            below = candidates[candidates[:, 0] < kth]
+            ties = candidates[candidates[:, 0] == kth]
+            ties = ties[np.lexsort((ties[:, 2], ties[:, 1]))][: k - len(below)]
+            candidates = np.concatenate((below, ties))
+        best = candidates
+
+        if len(best) == k:
+            limit = best[:, 0].max()
+
+    order = np.lexsort((best[:, 2], best[:, 1], best[:, 0]))
+    return best[order]
+
+
+def connect_numpy(points: list[Point], connections: int) -> DisjointSet:
+    coords = np.array(points, dtype=np.int64).reshape(-1, 3)
+    circuits = DisjointSet(len(points))
+    for _, i, j in closest_edges_numpy(coords, connections).tolist():
+        circuits.union(i, j)
+    return circuits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('path', nargs='?', default='./2025/day8/input.txt')
+    parser.add_argument('-n', '--connections', type=int, default=1000)
+    parser.add_argument(
+        '--example', action='store_true', help='use the example with 10 connections'
     )
+    parser.add_argument('--numpy', action='store_true', help='use the NumPy path')
+    parser.add_argument(
+        '--all', action='store_true', help='connect until one circuit remains'
+    )
+    args = parser.parse_args()
+
+    if args.numpy:
+        tracemalloc.start()
+    start = time.perf_counter()
+    if args.example:
+        text, connections = data, 10
+    else:
+        text, connections = open(args.path).read(), args.connections
+
+    points = [Point.parse(line) for line in text.splitlines() if line.strip()]
+
+    if args.all:
+        last = connect_all(points)
+        if last is not None:
+            p1, p2 = points[last[0]], points[last[1]]
+            print(f'last connection: {p1} - {p2}')
+            print(f'result: "{p1.x * p2.x}"')
+        print(f'Done in {time.perf_counter() - start:.6f} s')
+        return
+
+    circuits = (connect_numpy if args.numpy else connect)(points, connections)
+
+    a, b, c = sorted(circuits.component_sizes(), reverse=True)[:3]
+    print(f'result: "{a * b * c}"')
+    print(f'Done in {time.perf_counter() - start:.6f} s')
+    if args.numpy:
+        print(f'Peak memory {tracemalloc.get_traced_memory()[1] / 2**20:.1f} MiB')
 
 
 if __name__ == '__main__':
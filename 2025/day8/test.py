@@ -0,0 +1,59 @@
+import itertools
+import random
+
+import numpy as np
+
+from main import DisjointSet, Point, closest_edges_numpy, connect_all, iter_edges
+
+
+def all_edges(points: list[Point]) -> list[tuple[int, int, int]]:
+    return sorted(
+        (p.squared_distance(q), i, j)
+        for (i, p), (j, q) in itertools.combinations(enumerate(points), 2)
+    )
+
+
+def last_connection(points: list[Point]) -> tuple[int, int] | None:
+    circuits = DisjointSet(len(points))
+    for _, i, j in all_edges(points):
+        if circuits.union(i, j) and circuits.count == 1:
+            return i, j
+    return None
+
+
+def random_points(rng: random.Random, count: int, span: int) -> list[Point]:
+    return [Point(*(rng.randint(0, span) for _ in range(3))) for _ in range(count)]
+
+
+def test_outlier():
+    rng = random.Random(1)
+    points = random_points(rng, 80, 1000) + [Point(10**6, 5, 10**5)]
+
+    for batch in (50, None):
+        assert list(iter_edges(points, batch)) == all_edges(points)
+    assert connect_all(points) == last_connection(points)
+
+
+def test_clusters():
+    rng = random.Random(2)
+    centres = random_points(rng, 4, 10**6)
+    points = [
+        Point(*(c + rng.randint(0, 50) for c in rng.choice(centres)))
+        for _ in range(100)
+    ]
+
+    for batch in (50, None):
+        assert list(iter_edges(points, batch)) == all_edges(points)
+    assert connect_all(points) == last_connection(points)
+
+
+def test_closest_edges_numpy():
+    rng = random.Random(3)
+    points = random_points(rng, 60, 20)
+    coords = np.array(points, dtype=np.int64)
+    edges = all_edges(points)
+
+    for k in (0, 1, 50, len(edges), len(edges) + 10):
+        assert closest_edges_numpy(coords, k, block_elements=100).tolist() == [
+            list(edge) for edge in edges[:k]
+        ]